@@ -4,8 +4,6 @@
 import os
 import json
 import sys
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
 
 # OAuth2 scopes required for the application
 SCOPES = ['https://www.googleapis.com/auth/youtube.readonly']
@@ -13,6 +11,9 @@ SCOPES = ['https://www.googleapis.com/auth/youtube.readonly']
 
 def setup_oauth():
     """Guide user through OAuth2 setup process."""
+    # Imported here so loading this module stays cheap
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    
     print("YouTube Subscription Monitor - OAuth2 Setup")
     print("=" * 50)
     print()
@@ -3,23 +3,47 @@
 import json
 import os
 from datetime import datetime
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 
+from json_utils import json_dumps, json_loads
+from time_utils import to_epoch
+
 logger = logging.getLogger(__name__)
 
+# Write buffer for the state file, large enough to hold it in one write
+STATE_WRITE_BUFFER_SIZE = 64 * 1024
+
 
 class StateManager:
     """Manages the state file for tracking notified videos."""
     
-    def __init__(self, state_file_path: str = "data/state.json"):
+    def __init__(self, state_file_path: str = "data/state.json", pretty: bool = False):
         """Initialize the state manager.
         
         Args:
             state_file_path: Path to the state JSON file
+            pretty: Write indented JSON instead of compact JSON
         """
         self.state_file_path = state_file_path
+        self.pretty = pretty
+        
+        # Ensure directory exists (once, rather than on every save)
+        state_dir = os.path.dirname(state_file_path)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        
         self.state = self._load_state()
+        
+        # (channel_id, latest_video_id) pairs for constant-time is_new_video
+        self._seen = {
+            (channel_id, channel_state["latest_video_id"])
+            for channel_id, channel_state in self.state["channels"].items()
+            if channel_state.get("latest_video_id")
+        }
+        
+        # Set whenever the state changes so unchanged state is not rewritten
+        self._dirty = False
     
     def _load_state(self) -> Dict[str, Any]:
         """Load state from file or create default state.
@@ -29,8 +53,8 @@ class StateManager:
         """
         if os.path.exists(self.state_file_path):
             try:
-                with open(self.state_file_path, 'r') as f:
-                    return json.load(f)
+                with open(self.state_file_path, 'rb') as f:
+                    return json_loads(f.read())
             except (json.JSONDecodeError, IOError) as e:
                 logger.error(f"Error loading state file: {e}")
                 return self._default_state()
@@ -53,20 +77,52 @@ class StateManager:
             }
         }
     
-    def save_state(self) -> None:
-        """Save current state to file."""
+    def save_state(self, force: bool = False) -> None:
+        """Save current state to file.
+        
+        The other methods only change the in-memory state; this is the one
+        place it is written, so callers should save once per run. When
+        nothing changed since the last save only the last run marker is
+        touched, unless force is set.
+        
+        Args:
+            force: Write the state file even if nothing changed
+        """
+        if not self._dirty and not force:
+            self._touch_last_run()
+            logger.info("State unchanged, skipping save")
+            return
+        
         # Update last run timestamp
         self.state["metadata"]["last_run"] = datetime.utcnow().isoformat()
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(self.state_file_path), exist_ok=True)
+        # Serialize in one go (compact unless pretty output was requested)
+        payload = json_dumps(self.state, self.pretty)
         
-        # Write state to file
-        with open(self.state_file_path, 'w') as f:
-            json.dump(self.state, f, indent=2)
+        # Write to a temporary file and swap it in so a crash mid-write
+        # never leaves a truncated state file behind
+        tmp_path = self.state_file_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb', buffering=STATE_WRITE_BUFFER_SIZE) as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_file_path)
+        except OSError:
+            # Don't leave a partial temporary file next to the intact state file
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
         
+        self._dirty = False
         logger.info("State saved successfully")
     
+    def _touch_last_run(self) -> None:
+        """Record the last run time without rewriting the state file."""
+        last_run_path = os.path.join(os.path.dirname(self.state_file_path), "last_run.txt")
+        with open(last_run_path, 'w') as f:
+            f.write(datetime.utcnow().isoformat() + "\n")
+    
     def get_channel_state(self, channel_id: str) -> Optional[Dict[str, Any]]:
         """Get state for a specific channel.
         
@@ -88,14 +144,149 @@ class StateManager:
             latest_video_id: ID of the latest video
             video_timestamp: Timestamp of the latest video
         """
-        self.state["channels"][channel_id] = {
+        # Update in place so cached fields (e.g. uploads playlist) survive
+        channel_state = self.state["channels"].setdefault(channel_id, {})
+        self._seen.discard((channel_id, channel_state.get("latest_video_id")))
+        self._seen.add((channel_id, latest_video_id))
+        channel_state.update({
             "name": channel_name,
             "latest_video_id": latest_video_id,
             "latest_video_timestamp": video_timestamp,
+            "latest_video_epoch": to_epoch(video_timestamp),
             "last_checked": datetime.utcnow().isoformat()
+        })
+        self._dirty = True
+        
+        logger.debug("Updated state for channel %s (%s)", channel_name, channel_id)
+    
+    def get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
+        """Get the cached uploads playlist ID for a channel.
+        
+        Args:
+            channel_id: YouTube channel ID
+            
+        Returns:
+            Uploads playlist ID or None if not cached yet
+        """
+        channel_state = self.get_channel_state(channel_id)
+        return channel_state.get("uploads_playlist_id") if channel_state else None
+    
+    def set_uploads_playlist_id(self, channel_id: str, uploads_playlist_id: str) -> None:
+        """Cache the uploads playlist ID for a channel.
+        
+        Args:
+            channel_id: YouTube channel ID
+            uploads_playlist_id: ID of the channel's uploads playlist
+        """
+        channel_state = self.state["channels"].setdefault(channel_id, {})
+        channel_state["uploads_playlist_id"] = uploads_playlist_id
+        self._dirty = True
+    
+    def get_etag(self, channel_id: str, resource: str) -> Optional[str]:
+        """Get the stored ETag of a channel resource.
+        
+        Args:
+            channel_id: YouTube channel ID
+            resource: Resource the ETag belongs to ("feed" or "playlist")
+            
+        Returns:
+            ETag of the last response or None if not stored
+        """
+        channel_state = self.get_channel_state(channel_id)
+        return channel_state.get(f"{resource}_etag") if channel_state else None
+    
+    def set_etag(self, channel_id: str, resource: str, etag: str) -> None:
+        """Store the ETag of a channel resource.
+        
+        Args:
+            channel_id: YouTube channel ID
+            resource: Resource the ETag belongs to ("feed" or "playlist")
+            etag: ETag of the last response
+        """
+        channel_state = self.state["channels"].setdefault(channel_id, {})
+        key = f"{resource}_etag"
+        if channel_state.get(key) != etag:
+            channel_state[key] = etag
+            self._dirty = True
+    
+    def get_last_video_counts(self) -> Dict[str, int]:
+        """Get the video count of every channel as of its last check.
+        
+        Returns:
+            Dictionary mapping channel ID to video count
+        """
+        return {
+            channel_id: channel_state["video_count"]
+            for channel_id, channel_state in self.state["channels"].items()
+            if "video_count" in channel_state
         }
+    
+    def set_video_count(self, channel_id: str, video_count: int) -> None:
+        """Store the video count of a channel.
+        
+        Args:
+            channel_id: YouTube channel ID
+            video_count: Number of public videos on the channel
+        """
+        channel_state = self.state["channels"].setdefault(channel_id, {})
+        if channel_state.get("video_count") != video_count:
+            channel_state["video_count"] = video_count
+            self._dirty = True
+    
+    def is_check_pending(self, channel_id: str) -> bool:
+        """Check whether a channel's last check left work to retry.
+        
+        Args:
+            channel_id: YouTube channel ID
+            
+        Returns:
+            True if the channel must be checked again on the next run
+        """
+        channel_state = self.get_channel_state(channel_id)
+        return bool(channel_state and channel_state.get("check_pending"))
+    
+    def set_check_pending(self, channel_id: str, pending: bool) -> None:
+        """Mark whether a channel must be checked again on the next run.
+        
+        Only changes are written, so runs where every check succeeds leave
+        the state untouched.
         
-        logger.debug(f"Updated state for channel {channel_name} ({channel_id})")
+        Args:
+            channel_id: YouTube channel ID
+            pending: Whether the channel's fetch or notification failed
+        """
+        if pending == self.is_check_pending(channel_id):
+            return
+        channel_state = self.state["channels"].setdefault(channel_id, {})
+        if pending:
+            channel_state["check_pending"] = True
+        else:
+            del channel_state["check_pending"]
+        self._dirty = True
+    
+    def get_cached_subscriptions(self) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """Get the subscription list cached by an earlier run.
+        
+        Returns:
+            Tuple of (subscriptions, fetched_at timestamp), or (None, None)
+            if nothing is cached
+        """
+        cache = self.state.get("subscriptions")
+        if not cache:
+            return None, None
+        return cache["items"], cache["fetched_at"]
+    
+    def set_cached_subscriptions(self, subscriptions: List[Dict[str, Any]]) -> None:
+        """Cache the subscription list so later runs can skip fetching it.
+        
+        Args:
+            subscriptions: Subscriptions as dictionaries
+        """
+        self.state["subscriptions"] = {
+            "fetched_at": datetime.utcnow().isoformat(),
+            "items": subscriptions
+        }
+        self._dirty = True
     
     def is_new_video(self, channel_id: str, video_id: str) -> bool:
         """Check if a video is new (not previously notified).
@@ -107,18 +298,14 @@ class StateManager:
         Returns:
             True if video is new, False otherwise
         """
-        channel_state = self.get_channel_state(channel_id)
-        
-        if channel_state is None:
-            # First time seeing this channel
-            return True
-        
-        # Check if this video is different from the last notified one
-        return channel_state.get("latest_video_id") != video_id
+        # New unless it is the last notified video of the channel (this also
+        # covers channels seen for the first time)
+        return (channel_id, video_id) not in self._seen
     
     def increment_notification_count(self) -> None:
         """Increment the total notification count."""
         self.state["metadata"]["total_notifications_sent"] += 1
+        self._dirty = True
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics from the state.
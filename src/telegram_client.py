@@ -1,16 +1,30 @@
 """Telegram bot client for sending notifications."""
 
+import html
 import logging
-from typing import Optional, Dict, Any
-import telegram
+import string
+from typing import Optional, Dict, Any, List, Union
 from telegram import Bot
 from telegram.constants import ParseMode
+from telegram.error import BadRequest, NetworkError, RetryAfter
+from telegram.request import HTTPXRequest
 import asyncio
-from datetime import datetime, timezone
-import pytz
+import time
+
+from time_utils import to_epoch
 
 logger = logging.getLogger(__name__)
 
+# Default maximum of notifications in flight at once; all of them go to one
+# chat, which Telegram throttles well below its global ~30 messages/s
+MAX_CONCURRENT_SENDS = 5
+
+# Placeholders a notification template may use
+TEMPLATE_FIELDS = frozenset({"channel_name", "video_title", "video_url", "time_ago"})
+
+# (seconds per unit, unit name) used for "time ago" strings, largest first
+TIME_AGO_UNITS = ((86400, "day"), (3600, "hour"), (60, "minute"))
+
 
 class TelegramClient:
     """Client for sending notifications via Telegram."""
@@ -26,11 +40,62 @@ class TelegramClient:
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.config = config
-        self.bot = Bot(token=bot_token)
         
+        # Resolve settings once instead of on every notification
+        telegram_config = config["telegram"]
+        self._template = self._validate_template(telegram_config["notification_template"])
+        self._parse_mode = telegram_config.get("parse_mode", ParseMode.HTML)
+        self._disable_preview = telegram_config.get("disable_web_page_preview", False)
+        self._dry_run = config["general"].get("dry_run", False)
+        self._max_concurrent_sends = telegram_config.get("max_concurrent_sends", MAX_CONCURRENT_SENDS)
+        self._max_retries = config["general"].get("max_retries", 3)
+        self._retry_delay = config["general"].get("retry_delay_seconds", 5)
+        
+        # One pooled connection per concurrent send; PTB's default pool holds
+        # a single connection and times out under concurrent sends
+        self._request = HTTPXRequest(connection_pool_size=self._max_concurrent_sends)
+        self.bot = Bot(token=bot_token, request=self._request)
+        
+        # Titles and channel names may contain <, > or & which break HTML messages
+        self._escape_html = self._parse_mode == ParseMode.HTML
+        
+        # Reference time shared by all notifications of a batch
+        self._now_cached: Optional[float] = None
+        
+        # Duration of each send in send_notifications
+        self.send_durations_ns: List[int] = []
+        
+    @staticmethod
+    def _validate_template(template: str) -> str:
+        """Check a notification template once, before any message is sent.
+        
+        Templates use str.format syntax with the placeholders in
+        TEMPLATE_FIELDS, so a typo fails at startup rather than on every
+        notification.
+        
+        Args:
+            template: Notification template from the config
+            
+        Returns:
+            The template, unchanged
+            
+        Raises:
+            ValueError: If the template is malformed or uses unknown placeholders
+        """
+        try:
+            fields = {field for _, field, _, _ in string.Formatter().parse(template) if field is not None}
+        except ValueError as e:
+            raise ValueError(f"Invalid notification template: {e}") from e
+        
+        unknown_fields = fields - TEMPLATE_FIELDS
+        if unknown_fields:
+            raise ValueError(f"Unknown notification template placeholders: {', '.join(sorted(unknown_fields))}")
+        
+        return template
+    
     async def send_notification(self, channel_name: str, video_title: str, 
                               video_id: str, video_url: str, 
-                              published_at: str, thumbnail_url: Optional[str] = None) -> bool:
+                              published_at: Union[str, int], thumbnail_url: Optional[str] = None) -> bool:
         """Send a notification about a new video.
         
         Args:
@@ -38,7 +103,7 @@ class TelegramClient:
             video_title: Video title
             video_id: YouTube video ID
             video_url: Full URL to the video
-            published_at: Video publish timestamp
+            published_at: Video publish timestamp (ISO format or epoch seconds)
             thumbnail_url: Optional thumbnail URL
             
         Returns:
@@ -48,31 +113,40 @@ class TelegramClient:
             # Calculate time ago
             time_ago = self._calculate_time_ago(published_at)
             
+            # Escape text from YouTube once, before it goes into the template
+            # (the raw values are kept for logging)
+            if self._escape_html:
+                message_channel_name = html.escape(channel_name)
+                message_video_title = html.escape(video_title)
+            else:
+                message_channel_name = channel_name
+                message_video_title = video_title
+            
             # Format message using template
-            message_text = self.config["telegram"]["notification_template"].format(
-                channel_name=channel_name,
-                video_title=video_title,
-                video_url=video_url,
-                time_ago=time_ago
-            )
+            message_text = self._template.format_map({
+                'channel_name': message_channel_name,
+                'video_title': message_video_title,
+                'video_url': video_url,
+                'time_ago': time_ago
+            })
             
-            # Send message
-            if thumbnail_url and not self.config["general"].get("dry_run", False):
-                # Send with thumbnail
-                await self.bot.send_photo(
-                    chat_id=self.chat_id,
-                    photo=thumbnail_url,
-                    caption=message_text,
-                    parse_mode=self.config["telegram"].get("parse_mode", ParseMode.HTML)
-                )
-            else:
-                # Send text only
-                await self.bot.send_message(
-                    chat_id=self.chat_id,
-                    text=message_text,
-                    parse_mode=self.config["telegram"].get("parse_mode", ParseMode.HTML),
-                    disable_web_page_preview=self.config["telegram"].get("disable_web_page_preview", False)
-                )
+            # Send message, waiting out rate limits and transient network errors
+            for attempt in range(self._max_retries + 1):
+                try:
+                    await self._send_message(message_text, thumbnail_url)
+                    break
+                except RetryAfter as e:
+                    if attempt == self._max_retries:
+                        raise
+                    logger.warning(f"Telegram rate limit hit, retrying in {e.retry_after}s")
+                    await asyncio.sleep(e.retry_after)
+                except NetworkError as e:
+                    # BadRequest is a NetworkError too, but retrying won't fix it
+                    if isinstance(e, BadRequest) or attempt == self._max_retries:
+                        raise
+                    delay = self._retry_delay * 2 ** attempt
+                    logger.warning(f"Telegram request failed ({e}), retrying in {delay}s")
+                    await asyncio.sleep(delay)
             
             logger.info(f"Notification sent for video: {video_title} by {channel_name}")
             return True
@@ -81,30 +155,60 @@ class TelegramClient:
             logger.error(f"Error sending Telegram notification: {e}")
             return False
     
-    def send_notification_sync(self, channel_name: str, video_title: str,
-                             video_id: str, video_url: str, 
-                             published_at: str, thumbnail_url: Optional[str] = None) -> bool:
-        """Synchronous wrapper for send_notification.
+    async def _send_message(self, message_text: str, thumbnail_url: Optional[str]) -> None:
+        """Send a formatted message, with the thumbnail if there is one.
         
         Args:
-            Same as send_notification
+            message_text: Formatted message text
+            thumbnail_url: Optional thumbnail URL
+        """
+        if thumbnail_url and not self._dry_run:
+            # Send with thumbnail
+            await self.bot.send_photo(
+                chat_id=self.chat_id,
+                photo=thumbnail_url,
+                caption=message_text,
+                parse_mode=self._parse_mode
+            )
+        else:
+            # Send text only
+            await self.bot.send_message(
+                chat_id=self.chat_id,
+                text=message_text,
+                parse_mode=self._parse_mode,
+                disable_web_page_preview=self._disable_preview
+            )
+    
+    async def send_notifications(self, notifications: List[Dict[str, Any]]) -> List[bool]:
+        """Send several notifications concurrently.
+        
+        Args:
+            notifications: List of keyword argument dictionaries for send_notification
             
         Returns:
-            True if message sent successfully, False otherwise
+            List of send results, in the same order as notifications
         """
-        # Create new event loop if none exists
+        semaphore = asyncio.Semaphore(self._max_concurrent_sends)
+        
+        async def send(notification: Dict[str, Any]) -> bool:
+            async with semaphore:
+                started = time.perf_counter_ns()
+                try:
+                    return await self.send_notification(**notification)
+                finally:
+                    self.send_durations_ns.append(time.perf_counter_ns() - started)
+        
+        self._now_cached = time.time()
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        return loop.run_until_complete(
-            self.send_notification(
-                channel_name, video_title, video_id, 
-                video_url, published_at, thumbnail_url
-            )
-        )
+            results = await asyncio.gather(*(send(n) for n in notifications), return_exceptions=True)
+        finally:
+            self._now_cached = None
+        
+        return [result is True for result in results]
+    
+    async def close(self) -> None:
+        """Close the bot's HTTP connections."""
+        await self._request.shutdown()
     
     async def test_connection(self) -> bool:
         """Test the Telegram bot connection.
@@ -127,62 +231,35 @@ class TelegramClient:
             logger.error(f"Telegram connection test failed: {e}")
             return False
     
-    def test_connection_sync(self) -> bool:
-        """Synchronous wrapper for test_connection.
+    def _now(self) -> float:
+        """Get the current time, reusing the batch reference time if set.
         
         Returns:
-            True if connection successful, False otherwise
+            Current time as epoch seconds
         """
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        return loop.run_until_complete(self.test_connection())
+        return self._now_cached or time.time()
     
-    def _calculate_time_ago(self, published_at: str) -> str:
+    def _calculate_time_ago(self, published_at: Union[str, int]) -> str:
         """Calculate human-readable time ago string.
         
         Args:
-            published_at: ISO format timestamp
+            published_at: Epoch seconds, or an ISO format timestamp
             
         Returns:
             Human-readable time ago string
         """
-        try:
-            # Parse the published timestamp
-            published_time = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-            
-            # Get current time in UTC
-            current_time = datetime.now(timezone.utc)
-            
-            # Calculate difference
-            time_diff = current_time - published_time
-            
-            # Convert to human-readable format
-            if time_diff.days > 0:
-                if time_diff.days == 1:
-                    return "1 day ago"
-                else:
-                    return f"{time_diff.days} days ago"
-            
-            hours = time_diff.seconds // 3600
-            if hours > 0:
-                if hours == 1:
-                    return "1 hour ago"
-                else:
-                    return f"{hours} hours ago"
-            
-            minutes = (time_diff.seconds % 3600) // 60
-            if minutes > 0:
-                if minutes == 1:
-                    return "1 minute ago"
-                else:
-                    return f"{minutes} minutes ago"
-            
-            return "Just now"
-            
-        except Exception as e:
-            logger.error(f"Error calculating time ago: {e}")
+        # Parse only when no precomputed epoch is available
+        published_epoch = to_epoch(published_at) if isinstance(published_at, str) else published_at
+        if published_epoch is None:
+            logger.error(f"Error calculating time ago: invalid timestamp {published_at!r}")
             return "Recently"
+        
+        seconds = int(self._now() - published_epoch)
+        
+        # Use the largest unit that fits
+        for unit_seconds, unit in TIME_AGO_UNITS:
+            if seconds >= unit_seconds:
+                count = seconds // unit_seconds
+                return f"{count} {unit}{'s' if count > 1 else ''} ago"
+        
+        return "Just now"
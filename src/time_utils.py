@@ -0,0 +1,47 @@
+"""Helpers for working with YouTube timestamps."""
+
+import sys
+from datetime import datetime
+from typing import Optional
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+# datetime.fromisoformat only understands the "Z" UTC suffix from Python 3.11
+FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+def parse_timestamp(timestamp: str) -> datetime:
+    """Parse an ISO 8601 timestamp, using ciso8601 when it is installed.
+    
+    Args:
+        timestamp: ISO format timestamp (e.g. 2024-01-31T12:00:00Z)
+        
+    Returns:
+        Timezone-aware datetime
+        
+    Raises:
+        ValueError: If the timestamp cannot be parsed
+    """
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(timestamp)
+    if not FROMISOFORMAT_ACCEPTS_Z and timestamp.endswith('Z'):
+        timestamp = timestamp[:-1] + '+00:00'
+    return datetime.fromisoformat(timestamp)
+
+
+def to_epoch(timestamp: str) -> Optional[int]:
+    """Convert an ISO 8601 timestamp to Unix epoch seconds.
+    
+    Args:
+        timestamp: ISO format timestamp (e.g. 2024-01-31T12:00:00Z)
+        
+    Returns:
+        Seconds since the epoch, or None if the timestamp cannot be parsed
+    """
+    try:
+        return int(parse_timestamp(timestamp).timestamp())
+    except (AttributeError, TypeError, ValueError):
+        return None
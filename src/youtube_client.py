@@ -1,17 +1,76 @@
 """YouTube API client for fetching subscriptions and videos."""
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime, timedelta
 import os
+import time
+import xml.etree.ElementTree as ET
 
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+import aiohttp
 from googleapiclient.errors import HttpError
 
+from time_utils import to_epoch
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of IDs accepted by a single channels.list call
+CHANNELS_BATCH_SIZE = 50
+
+# Only the fields the client reads from playlistItems responses
+PLAYLIST_ITEM_FIELDS = "items/snippet(publishedAt,title,resourceId/videoId,thumbnails/high/url)"
+
+# Public Atom feed listing a channel's 15 most recent uploads (no quota cost)
+RSS_FEED_URL = "https://www.youtube.com/feeds/videos.xml"
+RSS_NAMESPACES = {
+    "a": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+    "media": "http://search.yahoo.com/mrss/"
+}
+# Direct REST endpoint, used where the discovery client would block the event loop
+API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+
+HTTP_TIMEOUT_SECONDS = 20
+
+# DNS results are reused for the whole run instead of aiohttp's default 10 s
+DNS_CACHE_TTL_SECONDS = 300
+
+# Idle connections are kept open this long so later batches can reuse them
+KEEPALIVE_TIMEOUT_SECONDS = 60
+
+# Maximum number of channels checked concurrently
+MAX_CONCURRENT_REQUESTS = 20
+
+# Returned instead of videos when a conditional request reports no changes
+NOT_MODIFIED = object()
+
+
+class ChannelFetchError(Exception):
+    """Raised when a channel's videos could not be fetched."""
+
+
+@dataclass(frozen=True, slots=True)
+class Subscription:
+    """A channel the authenticated user is subscribed to."""
+    
+    channel_id: str
+    channel_title: str
+    thumbnail_url: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class Video:
+    """A video uploaded to a channel."""
+    
+    video_id: str
+    title: str
+    published_at: str
+    published_epoch: Optional[int]
+    thumbnail_url: Optional[str]
+    video_url: str
+
 
 class YouTubeClient:
     """Client for interacting with YouTube Data API."""
@@ -29,7 +88,27 @@ class YouTubeClient:
         self.client_secret = client_secret
         self.refresh_token = refresh_token
         self.api_key = api_key
-        self.youtube = self._build_youtube_client()
+        self._youtube = None
+        self._uploads_playlist_ids: Dict[str, str] = {}
+        
+        # Last RSS feed / uploads playlist ETag per channel, sent as If-None-Match
+        self.feed_etags: Dict[str, str] = {}
+        self.playlist_etags: Dict[str, str] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Duration of each channel fetch in get_latest_videos_bulk
+        self.fetch_durations_ns: List[int] = []
+    
+    @property
+    def youtube(self):
+        """Authenticated YouTube API client, built on first use.
+        
+        Runs that only need public data (RSS feeds, API key requests) never
+        pay for the OAuth token exchange.
+        """
+        if self._youtube is None:
+            self._youtube = self._build_youtube_client()
+        return self._youtube
     
     def _build_youtube_client(self):
         """Build authenticated YouTube API client.
@@ -37,6 +116,12 @@ class YouTubeClient:
         Returns:
             Authenticated YouTube API client
         """
+        # Imported here so runs that never touch the API skip loading them
+        import google_auth_httplib2
+        import httplib2
+        from google.oauth2.credentials import Credentials
+        from googleapiclient.discovery import build
+        
         # Create credentials from refresh token
         credentials = Credentials(
             token=None,
@@ -47,48 +132,60 @@ class YouTubeClient:
             scopes=["https://www.googleapis.com/auth/youtube.readonly"]
         )
         
-        # Refresh the access token
-        credentials.refresh(Request())
+        # One authorized connection shared by every API call of this client;
+        # the access token is fetched on the first request and refreshed
+        # automatically once it expires
+        http = google_auth_httplib2.AuthorizedHttp(
+            credentials,
+            http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+        )
         
         # Build YouTube API client
-        return build('youtube', 'v3', credentials=credentials)
+        return build('youtube', 'v3', http=http)
     
-    def get_subscriptions(self) -> List[Dict[str, Any]]:
-        """Get all channel subscriptions for the authenticated user.
+    def iter_subscriptions(self) -> Iterator[Subscription]:
+        """Iterate over the authenticated user's channel subscriptions.
         
-        Returns:
-            List of subscription dictionaries
+        Pages are fetched lazily, so only one page (50 items) is held in
+        memory at a time. API errors are raised to the caller.
+        
+        Yields:
+            Subscription objects
         """
-        subscriptions = []
         next_page_token = None
         
-        try:
-            while True:
-                # Request subscriptions
-                request = self.youtube.subscriptions().list(
-                    part="snippet",
-                    mine=True,
-                    maxResults=50,
-                    pageToken=next_page_token
+        while True:
+            # Request subscriptions
+            request = self.youtube.subscriptions().list(
+                part="snippet",
+                mine=True,
+                maxResults=50,
+                pageToken=next_page_token
+            )
+            
+            response = request.execute()
+            
+            # Extract subscription data
+            for item in response.get('items', []):
+                yield Subscription(
+                    channel_id=item['snippet']['resourceId']['channelId'],
+                    channel_title=item['snippet']['title'],
+                    thumbnail_url=item['snippet']['thumbnails']['default']['url']
                 )
-                
-                response = request.execute()
-                
-                # Extract subscription data
-                for item in response.get('items', []):
-                    subscription = {
-                        'channel_id': item['snippet']['resourceId']['channelId'],
-                        'channel_title': item['snippet']['title'],
-                        'description': item['snippet']['description'],
-                        'thumbnail_url': item['snippet']['thumbnails']['default']['url']
-                    }
-                    subscriptions.append(subscription)
-                
-                # Check for next page
-                next_page_token = response.get('nextPageToken')
-                if not next_page_token:
-                    break
             
+            # Check for next page
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
+                break
+    
+    def get_subscriptions(self) -> List[Subscription]:
+        """Get all channel subscriptions for the authenticated user.
+        
+        Returns:
+            List of subscriptions
+        """
+        try:
+            subscriptions = list(self.iter_subscriptions())
             logger.info(f"Fetched {len(subscriptions)} subscriptions")
             return subscriptions
             
@@ -96,69 +193,432 @@ class YouTubeClient:
             logger.error(f"Error fetching subscriptions: {e}")
             return []
     
-    def get_channel_videos(self, channel_id: str, max_results: int = 5) -> List[Dict[str, Any]]:
+    @staticmethod
+    def derive_uploads_playlist_id(channel_id: str) -> Optional[str]:
+        """Derive a channel's uploads playlist ID without an API call.
+        
+        A channel's uploads playlist is its ID with the UC prefix replaced
+        by UU.
+        
+        Args:
+            channel_id: YouTube channel ID
+            
+        Returns:
+            Uploads playlist ID, or None if the channel ID is not in the
+            standard format
+        """
+        return 'UU' + channel_id[2:] if channel_id.startswith('UC') else None
+    
+    def get_uploads_playlist_ids(self, channel_ids: List[str]) -> Dict[str, str]:
+        """Resolve the uploads playlist ID for a list of channels.
+        
+        Standard channel IDs are converted locally; any others are looked up
+        in batches of 50 (the API limit). Results are remembered for the
+        lifetime of the client, since uploads playlists never change.
+        
+        Args:
+            channel_ids: YouTube channel IDs
+            
+        Returns:
+            Dictionary mapping channel ID to uploads playlist ID
+        """
+        # Only IDs in an unexpected format need an API call
+        for cid in channel_ids:
+            if cid not in self._uploads_playlist_ids:
+                derived_id = self.derive_uploads_playlist_id(cid)
+                if derived_id:
+                    self._uploads_playlist_ids[cid] = derived_id
+        
+        missing_ids = [cid for cid in channel_ids if cid not in self._uploads_playlist_ids]
+        
+        for start in range(0, len(missing_ids), CHANNELS_BATCH_SIZE):
+            chunk = missing_ids[start:start + CHANNELS_BATCH_SIZE]
+            
+            try:
+                request = self.youtube.channels().list(
+                    part="contentDetails",
+                    id=",".join(chunk),
+                    maxResults=CHANNELS_BATCH_SIZE
+                )
+                response = request.execute()
+                
+            except HttpError as e:
+                logger.error(f"Error resolving uploads playlists: {e}")
+                continue
+            
+            for item in response.get('items', []):
+                self._uploads_playlist_ids[item['id']] = item['contentDetails']['relatedPlaylists']['uploads']
+        
+        playlist_ids = {
+            cid: self._uploads_playlist_ids[cid]
+            for cid in channel_ids if cid in self._uploads_playlist_ids
+        }
+        
+        logger.info(f"Resolved uploads playlists for {len(playlist_ids)} of {len(channel_ids)} channels")
+        return playlist_ids
+    
+    def get_video_counts(self, channel_ids: List[str]) -> Dict[str, int]:
+        """Get the public video count of a list of channels.
+        
+        Channels are looked up in batches of 50, so checking N channels for
+        new uploads costs ceil(N/50) quota units.
+        
+        Args:
+            channel_ids: YouTube channel IDs
+            
+        Returns:
+            Dictionary mapping channel ID to its video count; channels that
+            could not be looked up are missing
+        """
+        video_counts = {}
+        
+        for start in range(0, len(channel_ids), CHANNELS_BATCH_SIZE):
+            chunk = channel_ids[start:start + CHANNELS_BATCH_SIZE]
+            
+            try:
+                request = self.youtube.channels().list(
+                    part="statistics",
+                    id=",".join(chunk),
+                    maxResults=CHANNELS_BATCH_SIZE,
+                    fields="items(id,statistics/videoCount)"
+                )
+                response = request.execute()
+                
+            except HttpError as e:
+                logger.error(f"Error fetching video counts: {e}")
+                continue
+            
+            for item in response.get('items', []):
+                video_count = item.get('statistics', {}).get('videoCount')
+                if video_count is not None:
+                    video_counts[item['id']] = int(video_count)
+        
+        return video_counts
+    
+    def get_channel_videos(self, channel_id: str, max_results: int = 5,
+                           uploads_playlist_id: Optional[str] = None) -> List[Video]:
         """Get recent videos from a channel.
         
         Args:
             channel_id: YouTube channel ID
             max_results: Maximum number of videos to return
+            uploads_playlist_id: Pre-resolved uploads playlist ID; looked up
+                via the API when omitted
             
         Returns:
-            List of video dictionaries
+            List of videos
         """
         try:
             # Get channel uploads playlist ID
-            channel_request = self.youtube.channels().list(
-                part="contentDetails",
-                id=channel_id
-            )
-            channel_response = channel_request.execute()
+            if uploads_playlist_id is None:
+                uploads_playlist_id = self.get_uploads_playlist_ids([channel_id]).get(channel_id)
             
-            if not channel_response.get('items'):
+            if not uploads_playlist_id:
                 logger.warning(f"Channel not found: {channel_id}")
                 return []
             
-            uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-            
             # Get recent videos from uploads playlist
             videos_request = self.youtube.playlistItems().list(
-                part="snippet,contentDetails",
+                part="snippet",
                 playlistId=uploads_playlist_id,
-                maxResults=max_results
+                maxResults=max_results,
+                fields=PLAYLIST_ITEM_FIELDS
             )
             videos_response = videos_request.execute()
             
-            videos = []
-            for item in videos_response.get('items', []):
-                video = {
-                    'video_id': item['contentDetails']['videoId'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'thumbnail_url': item['snippet']['thumbnails'].get('high', {}).get('url'),
-                    'video_url': f"https://www.youtube.com/watch?v={item['contentDetails']['videoId']}"
-                }
-                videos.append(video)
-            
-            return videos
+            return [self._parse_playlist_item(item) for item in videos_response.get('items', [])]
             
         except HttpError as e:
             logger.error(f"Error fetching videos for channel {channel_id}: {e}")
             return []
     
-    def get_latest_video(self, channel_id: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _parse_playlist_item(item: Dict[str, Any]) -> Video:
+        """Convert a playlistItems resource into a video.
+        
+        Args:
+            item: playlistItems resource from the API
+            
+        Returns:
+            Video
+        """
+        snippet = item['snippet']
+        video_id = snippet['resourceId']['videoId']
+        return Video(
+            video_id=video_id,
+            title=snippet['title'],
+            published_at=snippet['publishedAt'],
+            published_epoch=to_epoch(snippet['publishedAt']),
+            thumbnail_url=YouTubeClient._high_thumbnail_url(snippet),
+            video_url=f"https://www.youtube.com/watch?v={video_id}"
+        )
+    
+    @staticmethod
+    def _high_thumbnail_url(snippet: Dict[str, Any]) -> Optional[str]:
+        """Get the high resolution thumbnail URL from a snippet.
+        
+        Args:
+            snippet: Resource snippet from the API
+            
+        Returns:
+            Thumbnail URL or None if the snippet has no high thumbnail
+        """
+        # Nearly every snippet has one, so try/except beats chained .get() calls
+        try:
+            return snippet['thumbnails']['high']['url']
+        except KeyError:
+            return None
+    
+    def get_latest_video(self, channel_id: str,
+                         uploads_playlist_id: Optional[str] = None) -> Optional[Video]:
         """Get the latest video from a channel.
         
         Args:
             channel_id: YouTube channel ID
+            uploads_playlist_id: Optional pre-resolved uploads playlist ID
             
         Returns:
-            Latest video dictionary or None if no videos found
+            Latest video or None if no videos found
         """
-        videos = self.get_channel_videos(channel_id, max_results=1)
+        videos = self.get_channel_videos(channel_id, max_results=1,
+                                         uploads_playlist_id=uploads_playlist_id)
         return videos[0] if videos else None
     
-    def search_channel_videos(self, channel_id: str, published_after: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use.
+        
+        A single session is reused for all async requests so connections to
+        YouTube are kept alive between channels. Its pool is sized to the
+        number of concurrent requests so no connection sits idle, and DNS
+        lookups are cached for the whole run.
+        
+        Returns:
+            aiohttp client session
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=MAX_CONCURRENT_REQUESTS,
+                    ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS
+                ),
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self) -> "YouTubeClient":
+        self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def get_latest_videos_rss(self, channel_id: str) -> Any:
+        """Get recent videos from a channel's public RSS feed.
+        
+        The feed costs no API quota and is much smaller than an API response.
+        The request is conditional on the channel's entry in feed_etags,
+        which is updated from non-empty responses.
+        
+        Args:
+            channel_id: YouTube channel ID
+            
+        Returns:
+            List of videos (newest first), empty if the feed could not be
+            fetched, or NOT_MODIFIED if it is unchanged since the stored ETag
+        """
+        headers = {}
+        etag = self.feed_etags.get(channel_id)
+        if etag:
+            headers['If-None-Match'] = etag
+        
+        try:
+            async with self._get_session().get(RSS_FEED_URL, params={'channel_id': channel_id},
+                                               headers=headers) as response:
+                if response.status == 304:
+                    return NOT_MODIFIED
+                
+                if response.status != 200:
+                    logger.warning(f"RSS feed returned HTTP {response.status} for channel {channel_id}")
+                    return []
+                body = await response.read()
+                new_etag = response.headers.get('ETag')
+            
+            root = ET.fromstring(body)
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError, ET.ParseError) as e:
+            logger.warning(f"Error fetching RSS feed for channel {channel_id}: {e}")
+            return []
+        
+        videos = []
+        for entry in root.findall('a:entry', RSS_NAMESPACES):
+            video_id = entry.findtext('yt:videoId', namespaces=RSS_NAMESPACES)
+            if not video_id:
+                continue
+            
+            thumbnail = entry.find('media:group/media:thumbnail', RSS_NAMESPACES)
+            # Match the API's timestamp format (feed uses +00:00 instead of Z)
+            published_at = self._normalize_timestamp(
+                entry.findtext('a:published', default='', namespaces=RSS_NAMESPACES)
+            )
+            video = Video(
+                video_id=video_id,
+                title=entry.findtext('a:title', default='', namespaces=RSS_NAMESPACES),
+                published_at=published_at,
+                published_epoch=to_epoch(published_at),
+                thumbnail_url=thumbnail.get('url') if thumbnail is not None else None,
+                video_url=f"https://www.youtube.com/watch?v={video_id}"
+            )
+            videos.append(video)
+        
+        # An empty feed sends the caller to the API, so it must not be cached
+        if videos and new_etag:
+            self.feed_etags[channel_id] = new_etag
+        
+        return videos
+    
+    async def get_latest_video_async(self, channel_id: str,
+                                     uploads_playlist_id: Optional[str] = None) -> Any:
+        """Get the latest video from a channel, preferring the RSS feed.
+        
+        Falls back to the API only when the feed has no entry for the channel.
+        
+        Args:
+            channel_id: YouTube channel ID
+            uploads_playlist_id: Optional pre-resolved uploads playlist ID
+            
+        Returns:
+            Latest video, None if no videos found, or NOT_MODIFIED
+            if the channel is unchanged since the last request
+            
+        Raises:
+            ChannelFetchError: If neither the feed nor the API could be fetched
+        """
+        videos = await self.get_latest_videos_rss(channel_id)
+        if videos is NOT_MODIFIED:
+            return NOT_MODIFIED
+        if videos:
+            return videos[0]
+        
+        logger.debug("No RSS entries for channel %s, falling back to API", channel_id)
+        videos = await self.get_channel_videos_async(channel_id, max_results=1,
+                                                     uploads_playlist_id=uploads_playlist_id)
+        if videos is NOT_MODIFIED:
+            return NOT_MODIFIED
+        return videos[0] if videos else None
+    
+    async def get_channel_videos_async(self, channel_id: str, max_results: int = 5,
+                                       uploads_playlist_id: Optional[str] = None) -> Any:
+        """Get recent videos from a channel's uploads playlist without blocking.
+        
+        Calls the REST endpoint directly on the shared session since the
+        discovery client is synchronous. The request is conditional on the
+        channel's entry in playlist_etags, which is updated from the response.
+        
+        Args:
+            channel_id: YouTube channel ID
+            max_results: Maximum number of videos to return
+            uploads_playlist_id: Pre-resolved uploads playlist ID; taken from
+                the client's lookup cache when omitted
+            
+        Returns:
+            List of videos, or NOT_MODIFIED if the playlist is
+            unchanged since the stored ETag
+            
+        Raises:
+            ChannelFetchError: If the playlist could not be fetched, so a
+                failure is never mistaken for a channel without videos
+        """
+        # Only use already resolved IDs here; a blocking lookup would stall the loop
+        if uploads_playlist_id is None:
+            uploads_playlist_id = self._uploads_playlist_ids.get(channel_id)
+        
+        if not uploads_playlist_id:
+            logger.warning(f"Channel not found: {channel_id}")
+            return []
+        
+        params = {
+            'part': 'snippet',
+            'playlistId': uploads_playlist_id,
+            'maxResults': max_results,
+            'fields': PLAYLIST_ITEM_FIELDS,
+            'key': self.api_key
+        }
+        
+        headers = {}
+        etag = self.playlist_etags.get(channel_id)
+        if etag:
+            headers['If-None-Match'] = etag
+        
+        try:
+            async with self._get_session().get(f"{API_BASE_URL}/playlistItems",
+                                               params=params, headers=headers) as response:
+                if response.status == 304:
+                    return NOT_MODIFIED
+                
+                if response.status != 200:
+                    raise ChannelFetchError(f"Uploads playlist returned HTTP {response.status}")
+                videos_response = await response.json()
+                
+                if response.headers.get('ETag'):
+                    self.playlist_etags[channel_id] = response.headers['ETag']
+                
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise ChannelFetchError(f"Error fetching uploads playlist: {e!r}") from e
+        
+        return [self._parse_playlist_item(item) for item in videos_response.get('items', [])]
+    
+    async def get_latest_videos_bulk(self, channel_ids: List[str],
+                                     uploads_playlist_ids: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Get the latest video of many channels concurrently.
+        
+        At most MAX_CONCURRENT_REQUESTS channels are fetched at once.
+        
+        Args:
+            channel_ids: YouTube channel IDs
+            uploads_playlist_ids: Optional mapping of channel ID to uploads playlist ID
+            
+        Returns:
+            Dictionary mapping channel ID to its latest video,
+            None if it has no videos, NOT_MODIFIED if it is unchanged, or the
+            exception raised while fetching
+        """
+        uploads_playlist_ids = uploads_playlist_ids or {}
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        async def fetch(channel_id: str) -> Any:
+            async with semaphore:
+                started = time.perf_counter_ns()
+                try:
+                    return await self.get_latest_video_async(channel_id, uploads_playlist_ids.get(channel_id))
+                finally:
+                    self.fetch_durations_ns.append(time.perf_counter_ns() - started)
+        
+        results = await asyncio.gather(*(fetch(channel_id) for channel_id in channel_ids),
+                                       return_exceptions=True)
+        return dict(zip(channel_ids, results))
+    
+    @staticmethod
+    def _normalize_timestamp(timestamp: str) -> str:
+        """Convert a UTC offset timestamp to the API's trailing-Z format.
+        
+        Args:
+            timestamp: ISO format timestamp
+            
+        Returns:
+            ISO format timestamp ending in Z when the offset is UTC
+        """
+        if timestamp.endswith('+00:00'):
+            return timestamp[:-6] + 'Z'
+        return timestamp
+    
+    def search_channel_videos(self, channel_id: str, published_after: Optional[datetime] = None) -> List[Video]:
         """Search for videos from a channel published after a certain date.
         
         Args:
@@ -166,7 +626,7 @@ class YouTubeClient:
             published_after: Optional datetime to filter videos
             
         Returns:
-            List of video dictionaries
+            List of videos
         """
         try:
             # Default to videos from last 24 hours if no date specified
@@ -189,14 +649,16 @@ class YouTubeClient:
             
             videos = []
             for item in search_response.get('items', []):
-                video = {
-                    'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'thumbnail_url': item['snippet']['thumbnails'].get('high', {}).get('url'),
-                    'video_url': f"https://www.youtube.com/watch?v={item['id']['videoId']}"
-                }
+                snippet = item['snippet']
+                video_id = item['id']['videoId']
+                video = Video(
+                    video_id=video_id,
+                    title=snippet['title'],
+                    published_at=snippet['publishedAt'],
+                    published_epoch=to_epoch(snippet['publishedAt']),
+                    thumbnail_url=self._high_thumbnail_url(snippet),
+                    video_url=f"https://www.youtube.com/watch?v={video_id}"
+                )
                 videos.append(video)
             
             return videos
@@ -2,15 +2,21 @@
 
 import os
 import sys
-import json
 import logging
 import argparse
-from typing import Dict, Any
-from datetime import datetime, timedelta, timezone
+import asyncio
+import statistics
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
 
-from youtube_client import YouTubeClient
+from youtube_client import YouTubeClient, Subscription, Video, NOT_MODIFIED
 from telegram_client import TelegramClient
 from state_manager import StateManager
+from json_utils import json_loads
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +28,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Width of the adaptive polling window, in check intervals
+POLL_WINDOW_FACTOR = 1.5
+
+# Environment variable holding each secret
+SECRET_ENV_VARS = {
+    'youtube_client_id': 'YOUTUBE_CLIENT_ID',
+    'youtube_client_secret': 'YOUTUBE_CLIENT_SECRET',
+    'youtube_refresh_token': 'YOUTUBE_REFRESH_TOKEN',
+    'youtube_api_key': 'YOUTUBE_API_KEY',
+    'telegram_bot_token': 'TELEGRAM_BOT_TOKEN',
+    'telegram_chat_id': 'TELEGRAM_CHAT_ID'
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Secrets:
+    """Credentials read from the environment."""
+    
+    # Values are left out of the repr so they never end up in logs or tracebacks
+    youtube_client_id: str = field(repr=False)
+    youtube_client_secret: str = field(repr=False)
+    youtube_refresh_token: str = field(repr=False)
+    youtube_api_key: str = field(repr=False)
+    telegram_bot_token: str = field(repr=False)
+    telegram_chat_id: str = field(repr=False)
+    
+    @classmethod
+    def from_env(cls) -> "Secrets":
+        """Read all secrets from environment variables.
+        
+        Returns:
+            Secrets instance
+            
+        Raises:
+            ValueError: If any of the variables is missing or empty
+        """
+        values = {name: os.environ.get(var) for name, var in SECRET_ENV_VARS.items()}
+        missing_vars = [SECRET_ENV_VARS[name] for name, value in values.items() if not value]
+        if missing_vars:
+            raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
+        return cls(**values)
+
 
 class YouTubeMonitor:
     """Main class for monitoring YouTube subscriptions."""
@@ -35,17 +83,37 @@ class YouTubeMonitor:
         # Load configuration
         self.config = self._load_config(config_path)
         
-        # Initialize clients
-        self.youtube_client = self._init_youtube_client()
-        self.telegram_client = self._init_telegram_client()
-        self.state_manager = StateManager()
+        # Initialize clients, failing early if any credential is missing
+        secrets = Secrets.from_env()
+        self.youtube_client = self._init_youtube_client(secrets)
+        self.telegram_client = self._init_telegram_client(secrets)
+        self.state_manager = StateManager(pretty=self.config['general'].get('debug', False))
+        
+        # New videos found during the run, sent together once all channels are checked
+        self._pending_notifications = []
+        
+        # Current video count per channel, stored once the channel is processed
+        self._video_counts: Dict[str, int] = {}
+        
+        # Settings read on every video, resolved once since the config does not change
+        self._dry_run = bool(self.config.get('general', {}).get('dry_run', False))
+        self._max_age = timedelta(days=self.config.get('youtube', {}).get('max_video_age_days', 7))
+        
+        # Oldest publish time (epoch seconds) still recent enough to notify
+        # about, set at the start of each run
+        self._cutoff_epoch = time.time() - self._max_age.total_seconds()
         
         # Statistics
         self.stats = {
             'channels_checked': 0,
+            'channels_skipped': 0,
             'new_videos_found': 0,
             'notifications_sent': 0,
-            'errors': 0
+            'errors': 0,
+            # Wall time spent on YouTube, Telegram and the state file
+            'yt_ns': 0,
+            'tg_ns': 0,
+            'state_ns': 0
         }
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
@@ -60,79 +128,106 @@ class YouTubeMonitor:
         if not os.path.exists(config_path):
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        with open(config_path, 'rb') as f:
+            return json_loads(f.read())
     
-    def _init_youtube_client(self) -> YouTubeClient:
-        """Initialize YouTube client from environment variables.
+    def _init_youtube_client(self, secrets: Secrets) -> YouTubeClient:
+        """Initialize YouTube client.
         
+        Args:
+            secrets: Credentials read from the environment
+            
         Returns:
             YouTubeClient instance
         """
-        required_vars = [
-            'YOUTUBE_CLIENT_ID',
-            'YOUTUBE_CLIENT_SECRET',
-            'YOUTUBE_REFRESH_TOKEN',
-            'YOUTUBE_API_KEY'
-        ]
-        
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
-        if missing_vars:
-            raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
-        
         return YouTubeClient(
-            client_id=os.getenv('YOUTUBE_CLIENT_ID'),
-            client_secret=os.getenv('YOUTUBE_CLIENT_SECRET'),
-            refresh_token=os.getenv('YOUTUBE_REFRESH_TOKEN'),
-            api_key=os.getenv('YOUTUBE_API_KEY')
+            client_id=secrets.youtube_client_id,
+            client_secret=secrets.youtube_client_secret,
+            refresh_token=secrets.youtube_refresh_token,
+            api_key=secrets.youtube_api_key
         )
     
-    def _init_telegram_client(self) -> TelegramClient:
-        """Initialize Telegram client from environment variables.
+    def _init_telegram_client(self, secrets: Secrets) -> TelegramClient:
+        """Initialize Telegram client.
         
+        Args:
+            secrets: Credentials read from the environment
+            
         Returns:
             TelegramClient instance
         """
-        bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
-        chat_id = os.getenv('TELEGRAM_CHAT_ID')
-        
-        if not bot_token or not chat_id:
-            raise ValueError("Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID environment variables")
-        
-        return TelegramClient(bot_token, chat_id, self.config)
+        return TelegramClient(secrets.telegram_bot_token, secrets.telegram_chat_id, self.config)
     
-    def run(self, test_mode: bool = False) -> Dict[str, Any]:
+    async def run(self, test_mode: bool = False, refresh_subscriptions: bool = False) -> Dict[str, Any]:
         """Run the monitoring process.
         
         Args:
             test_mode: If True, only test connections without processing
+            refresh_subscriptions: If True, fetch subscriptions even if cached
             
         Returns:
             Dictionary with execution results
         """
         logger.info("Starting YouTube subscription monitor...")
         
+        # Age checks for every video are made against the same moment
+        self._cutoff_epoch = time.time() - self._max_age.total_seconds()
+        
         try:
             # Test connections if requested
             if test_mode:
-                return self._test_connections()
+                return await self._test_connections()
             
             # Get all subscriptions
-            subscriptions = self.youtube_client.get_subscriptions()
+            with self._timed('yt_ns'):
+                subscriptions = self._get_subscriptions(refresh_subscriptions)
             if not subscriptions:
                 logger.warning("No subscriptions found")
                 return self.stats
             
             logger.info(f"Found {len(subscriptions)} subscriptions")
             
+            # Check quiet channels less often
+            adaptive_polling = self.config.get('youtube', {}).get('adaptive_polling', False)
+            if adaptive_polling:
+                subscriptions = self._filter_due_channels(subscriptions)
+            
+            # Only look closer at channels whose upload count changed
+            with self._timed('yt_ns'):
+                if self.config.get('youtube', {}).get('skip_unchanged_video_counts', False):
+                    subscriptions = self._filter_changed_channels(subscriptions)
+                
+                # Resolve uploads playlists up front (cached in state across runs)
+                uploads_playlist_ids = self._resolve_uploads_playlist_ids(subscriptions)
+                
+                # Fetch the latest video of every channel concurrently
+                latest_videos = await self._fetch_latest_videos(subscriptions, uploads_playlist_ids)
+            
             # Check each subscription for new videos
             for subscription in subscriptions:
-                self._check_channel_for_new_videos(subscription)
+                self._check_channel_for_new_videos(
+                    subscription,
+                    latest_videos.get(subscription.channel_id)
+                )
+            
+            # Send all notifications in one batch
+            with self._timed('tg_ns'):
+                await self._send_pending_notifications()
+            
+            # Remember ETags and video counts so unchanged channels can be
+            # skipped next run
+            self._store_etags(latest_videos)
+            self._store_video_counts(latest_videos)
+            
+            if adaptive_polling:
+                self._store_check_pending(subscriptions, latest_videos)
             
             # Save state
-            self.state_manager.save_state()
+            with self._timed('state_ns'):
+                self.state_manager.save_state()
             
             # Log statistics
+            self._log_timings()
             logger.info(f"Monitoring complete. Stats: {self.stats}")
             
             return self.stats
@@ -141,118 +236,399 @@ class YouTubeMonitor:
             logger.error(f"Error during monitoring: {e}")
             self.stats['errors'] += 1
             return self.stats
+        
+        finally:
+            await self.telegram_client.close()
+    
+    @contextmanager
+    def _timed(self, stat: str) -> Iterator[None]:
+        """Add the wall time spent in the block to a stats counter.
+        
+        Args:
+            stat: Name of the nanosecond counter in self.stats
+        """
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.stats[stat] += time.perf_counter_ns() - started
+    
+    def _log_timings(self) -> None:
+        """Log p50/p95 latencies of the individual YouTube and Telegram calls."""
+        for name, durations_ns in (('YouTube fetch', self.youtube_client.fetch_durations_ns),
+                                   ('Telegram send', self.telegram_client.send_durations_ns)):
+            if len(durations_ns) < 2:
+                continue
+            # 20-quantiles: index 9 is the median, index 18 the 95th percentile
+            cut_points = statistics.quantiles(durations_ns, n=20, method='inclusive')
+            logger.info(f"{name} latency over {len(durations_ns)} calls: "
+                        f"p50 {cut_points[9] / 1e6:.1f} ms, p95 {cut_points[18] / 1e6:.1f} ms")
+    
+    def _get_subscriptions(self, refresh: bool = False) -> List[Subscription]:
+        """Get subscriptions from the state cache, fetching them when it is stale.
+        
+        Args:
+            refresh: Fetch subscriptions even if the cache is still fresh
+            
+        Returns:
+            List of subscriptions
+        """
+        cached, fetched_at = self.state_manager.get_cached_subscriptions()
+        cache_hours = self.config.get('youtube', {}).get('subscriptions_cache_hours', 24)
+        
+        if cached is not None and not refresh:
+            age = datetime.utcnow() - datetime.fromisoformat(fetched_at)
+            if age < timedelta(hours=cache_hours):
+                logger.info(f"Using {len(cached)} cached subscriptions from {fetched_at}")
+                return [Subscription(**item) for item in cached]
+        
+        subscriptions = self.youtube_client.get_subscriptions()
+        
+        # An empty list usually means the request failed, so fall back to the
+        # stale cache rather than checking nothing
+        if not subscriptions:
+            if cached is not None:
+                logger.warning(f"Could not fetch subscriptions, using cached list from {fetched_at}")
+                return [Subscription(**item) for item in cached]
+            return subscriptions
+        
+        self.state_manager.set_cached_subscriptions([asdict(subscription) for subscription in subscriptions])
+        return subscriptions
+    
+    def _filter_due_channels(self, subscriptions: List[Subscription]) -> List[Subscription]:
+        """Drop subscriptions that are not due for a check yet.
+        
+        A channel's polling interval doubles with the time since its latest
+        video was published, from check_interval_minutes up to
+        max_poll_interval_minutes, so a new video resets it. The schedule is
+        derived from the clock and the latest video only, so runs that find
+        nothing new don't have to write the state file. Channels never seen
+        before or whose last check failed are always due.
+        
+        Args:
+            subscriptions: List of subscriptions
+            
+        Returns:
+            Subscriptions that are due for a check
+        """
+        youtube_config = self.config.get('youtube', {})
+        base_interval = youtube_config.get('check_interval_minutes', 30) * 60
+        max_interval = youtube_config.get('max_poll_interval_minutes', 360) * 60
+        # Scheduled runs drift, so the window is wider than the run interval
+        # and a late run still falls into it
+        window = base_interval * POLL_WINDOW_FACTOR
+        now = int(time.time())
+        
+        due = []
+        for subscription in subscriptions:
+            channel_id = subscription.channel_id
+            channel_state = self.state_manager.get_channel_state(channel_id) or {}
+            latest_video_epoch = channel_state.get("latest_video_epoch")
+            if latest_video_epoch is None or self.state_manager.is_check_pending(channel_id):
+                due.append(subscription)
+                continue
+            
+            interval = self._poll_interval(now - latest_video_epoch, base_interval, max_interval)
+            # Each channel is checked in the first window of every interval,
+            # offset per channel so checks spread across runs
+            offset = zlib.crc32(channel_id.encode()) % interval
+            if interval <= window or (now + offset) % interval < window:
+                due.append(subscription)
+        
+        self.stats['channels_skipped'] += len(subscriptions) - len(due)
+        logger.info(f"{len(due)} of {len(subscriptions)} channels are due for a check")
+        return due
+    
+    @staticmethod
+    def _poll_interval(quiet_seconds: int, base_interval: int, max_interval: int) -> int:
+        """Get the polling interval of a channel.
+        
+        Args:
+            quiet_seconds: Time since the channel's latest video was published
+            base_interval: Shortest interval in seconds
+            max_interval: Longest interval in seconds
+            
+        Returns:
+            The base interval doubled for every base interval doubling of the
+            quiet time, capped at max_interval
+        """
+        doublings = max(int(quiet_seconds // base_interval).bit_length() - 1, 0)
+        return min(base_interval << doublings, max_interval)
+    
+    def _filter_changed_channels(self, subscriptions: List[Subscription]) -> List[Subscription]:
+        """Drop subscriptions whose video count is unchanged since the last run.
+        
+        Channels without a known previous or current count are kept.
+        
+        Args:
+            subscriptions: List of subscriptions
+            
+        Returns:
+            Subscriptions that need to be checked for new videos
+        """
+        self._video_counts = self.youtube_client.get_video_counts(
+            [subscription.channel_id for subscription in subscriptions]
+        )
+        last_video_counts = self.state_manager.get_last_video_counts()
+        
+        changed = []
+        for subscription in subscriptions:
+            channel_id = subscription.channel_id
+            video_count = self._video_counts.get(channel_id)
+            if video_count is None or last_video_counts.get(channel_id) != video_count:
+                changed.append(subscription)
+        
+        self.stats['channels_skipped'] += len(subscriptions) - len(changed)
+        logger.info(f"{len(changed)} of {len(subscriptions)} channels changed their video count")
+        return changed
     
-    def _check_channel_for_new_videos(self, subscription: Dict[str, Any]) -> None:
-        """Check a channel for new videos and send notifications.
+    def _resolve_uploads_playlist_ids(self, subscriptions: List[Subscription]) -> Dict[str, str]:
+        """Get uploads playlist IDs for all subscriptions.
+        
+        Standard channel IDs are converted locally and IDs cached in the
+        state file are reused; the rest are looked up in batches and cached
+        for subsequent runs.
         
         Args:
-            subscription: Subscription dictionary with channel info
+            subscriptions: List of subscriptions
+            
+        Returns:
+            Dictionary mapping channel ID to uploads playlist ID
+        """
+        uploads_playlist_ids = {}
+        missing_channel_ids = []
+        
+        for subscription in subscriptions:
+            channel_id = subscription.channel_id
+            known_id = (YouTubeClient.derive_uploads_playlist_id(channel_id)
+                        or self.state_manager.get_uploads_playlist_id(channel_id))
+            if known_id:
+                uploads_playlist_ids[channel_id] = known_id
+            else:
+                missing_channel_ids.append(channel_id)
+        
+        if missing_channel_ids:
+            resolved = self.youtube_client.get_uploads_playlist_ids(missing_channel_ids)
+            for channel_id, playlist_id in resolved.items():
+                self.state_manager.set_uploads_playlist_id(channel_id, playlist_id)
+            uploads_playlist_ids.update(resolved)
+        
+        return uploads_playlist_ids
+    
+    async def _fetch_latest_videos(self, subscriptions: List[Subscription],
+                                   uploads_playlist_ids: Dict[str, str]) -> Dict[str, Any]:
+        """Fetch the latest video for each subscription concurrently.
+        
+        Args:
+            subscriptions: List of subscriptions
+            uploads_playlist_ids: Dictionary mapping channel ID to uploads playlist ID
+            
+        Returns:
+            Dictionary mapping channel ID to its latest video (None if it has
+            none, NOT_MODIFIED if unchanged since the last run)
         """
-        channel_id = subscription['channel_id']
-        channel_name = subscription['channel_title']
+        channel_names = {s.channel_id: s.channel_title for s in subscriptions}
+        latest_videos = {}
         
-        logger.debug(f"Checking channel: {channel_name}")
+        # Make feed and playlist requests conditional on the ETags from the last run
+        for resource, etags in self._client_etags():
+            for channel_id in channel_names:
+                etag = self.state_manager.get_etag(channel_id, resource)
+                if etag:
+                    etags[channel_id] = etag
+        
+        async with self.youtube_client:
+            results = await self.youtube_client.get_latest_videos_bulk(
+                list(channel_names), uploads_playlist_ids
+            )
+        
+        for channel_id, result in results.items():
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching latest video for {channel_names[channel_id]}: {result}")
+                self.stats['errors'] += 1
+            else:
+                latest_videos[channel_id] = result
+        
+        return latest_videos
+    
+    def _check_channel_for_new_videos(self, subscription: Subscription,
+                                      latest_video: Optional[Video]) -> None:
+        """Check a channel's latest video and queue a notification if it is new.
+        
+        Args:
+            subscription: Subscription with channel info
+            latest_video: Latest video of the channel, or None if it has none
+        """
+        channel_id = subscription.channel_id
+        channel_name = subscription.channel_title
+        
+        logger.debug("Checking channel: %s", channel_name)
         self.stats['channels_checked'] += 1
         
         try:
-            # Get latest video from channel
-            latest_video = self.youtube_client.get_latest_video(channel_id)
+            if latest_video is NOT_MODIFIED:
+                logger.debug("Channel unchanged since last run: %s", channel_name)
+                return
             
             if not latest_video:
-                logger.debug(f"No videos found for channel: {channel_name}")
+                logger.debug("No videos found for channel: %s", channel_name)
                 return
             
             # Check if video is recent enough to notify about
-            if not self._is_video_recent_enough(latest_video['published_at']):
-                logger.debug(f"Video too old, skipping: {latest_video['title']} by {channel_name}")
-                # Still update state to avoid checking this old video again
-                self.state_manager.update_channel_state(
-                    channel_id=channel_id,
-                    channel_name=channel_name,
-                    latest_video_id=latest_video['video_id'],
-                    video_timestamp=latest_video['published_at']
-                )
+            if not self._is_video_recent_enough(latest_video):
+                logger.debug("Video too old, skipping: %s by %s", latest_video.title, channel_name)
+                # Still record it (once) to avoid checking this old video again
+                if self.state_manager.is_new_video(channel_id, latest_video.video_id):
+                    self.state_manager.update_channel_state(
+                        channel_id=channel_id,
+                        channel_name=channel_name,
+                        latest_video_id=latest_video.video_id,
+                        video_timestamp=latest_video.published_at
+                    )
                 return
             
             # Check if this is a new video
-            if self.state_manager.is_new_video(channel_id, latest_video['video_id']):
-                logger.info(f"New video found: {latest_video['title']} by {channel_name}")
+            if self.state_manager.is_new_video(channel_id, latest_video.video_id):
+                logger.info(f"New video found: {latest_video.title} by {channel_name}")
                 self.stats['new_videos_found'] += 1
                 
-                # Send notification
-                if self._send_notification(channel_name, latest_video):
-                    # Update state only if notification was sent successfully
-                    self.state_manager.update_channel_state(
-                        channel_id=channel_id,
-                        channel_name=channel_name,
-                        latest_video_id=latest_video['video_id'],
-                        video_timestamp=latest_video['published_at']
-                    )
-                    self.state_manager.increment_notification_count()
-                    self.stats['notifications_sent'] += 1
+                # Queue notification; state is updated once it has been sent
+                self._pending_notifications.append((channel_id, channel_name, latest_video))
             else:
-                logger.debug(f"No new videos for channel: {channel_name}")
+                logger.debug("No new videos for channel: %s", channel_name)
                 
         except Exception as e:
             logger.error(f"Error checking channel {channel_name}: {e}")
             self.stats['errors'] += 1
     
-    def _send_notification(self, channel_name: str, video: Dict[str, Any]) -> bool:
-        """Send notification for a new video.
+    async def _send_pending_notifications(self) -> None:
+        """Send all queued notifications and record the ones that went out."""
+        if not self._pending_notifications:
+            return
+        
+        if self._dry_run:
+            for _, _, video in self._pending_notifications:
+                logger.info(f"[DRY RUN] Would send notification for: {video.title}")
+            results = [True] * len(self._pending_notifications)
+        else:
+            results = await self.telegram_client.send_notifications([
+                {
+                    'channel_name': channel_name,
+                    'video_title': video.title,
+                    'video_id': video.video_id,
+                    'video_url': video.video_url,
+                    'published_at': video.published_epoch or video.published_at,
+                    'thumbnail_url': video.thumbnail_url
+                }
+                for _, channel_name, video in self._pending_notifications
+            ])
+        
+        for (channel_id, channel_name, video), sent in zip(self._pending_notifications, results):
+            # Update state only if notification was sent successfully
+            if not sent:
+                continue
+            self.state_manager.update_channel_state(
+                channel_id=channel_id,
+                channel_name=channel_name,
+                latest_video_id=video.video_id,
+                video_timestamp=video.published_at
+            )
+            self.state_manager.increment_notification_count()
+            self.stats['notifications_sent'] += 1
+        
+        self._pending_notifications = []
+    
+    def _client_etags(self) -> List[Tuple[str, Dict[str, str]]]:
+        """Get the YouTube client's ETag maps with their state resource names.
+        
+        Returns:
+            List of (resource, channel ID to ETag dictionary) tuples
+        """
+        return [
+            ('feed', self.youtube_client.feed_etags),
+            ('playlist', self.youtube_client.playlist_etags)
+        ]
+    
+    def _is_channel_settled(self, channel_id: str, latest_videos: Dict[str, Any]) -> bool:
+        """Check whether a channel's latest fetch result is fully recorded.
+        
+        A channel is not settled if its fetch failed or its new video could
+        not be notified, so it must be fetched (and retried) again next run.
         
         Args:
-            channel_name: Channel name
-            video: Video dictionary
+            channel_id: YouTube channel ID
+            latest_videos: Dictionary mapping channel ID to its latest video
             
         Returns:
-            True if notification sent successfully
+            True if nothing is left to do for the channel
         """
-        if self.config['general'].get('dry_run', False):
-            logger.info(f"[DRY RUN] Would send notification for: {video['title']}")
+        if channel_id not in latest_videos:
+            return False
+        
+        latest_video = latest_videos[channel_id]
+        if latest_video is NOT_MODIFIED or latest_video is None:
             return True
         
-        return self.telegram_client.send_notification_sync(
-            channel_name=channel_name,
-            video_title=video['title'],
-            video_id=video['video_id'],
-            video_url=video['video_url'],
-            published_at=video['published_at'],
-            thumbnail_url=video.get('thumbnail_url')
-        )
+        return not self.state_manager.is_new_video(channel_id, latest_video.video_id)
+    
+    def _store_etags(self, latest_videos: Dict[str, Any]) -> None:
+        """Persist ETags of settled channels.
+        
+        Args:
+            latest_videos: Dictionary mapping channel ID to its latest video
+        """
+        for resource, etags in self._client_etags():
+            for channel_id, etag in etags.items():
+                if self._is_channel_settled(channel_id, latest_videos):
+                    self.state_manager.set_etag(channel_id, resource, etag)
     
-    def _is_video_recent_enough(self, published_at: str) -> bool:
+    def _store_video_counts(self, latest_videos: Dict[str, Any]) -> None:
+        """Persist video counts of settled channels.
+        
+        Args:
+            latest_videos: Dictionary mapping channel ID to its latest video
+        """
+        for channel_id, video_count in self._video_counts.items():
+            if self._is_channel_settled(channel_id, latest_videos):
+                self.state_manager.set_video_count(channel_id, video_count)
+    
+    def _store_check_pending(self, fetched_subscriptions: List[Subscription],
+                             latest_videos: Dict[str, Any]) -> None:
+        """Flag channels that must be checked again regardless of their schedule.
+        
+        Channels whose fetch failed or whose new video could not be notified
+        are flagged; the flag is cleared once they settle.
+        
+        Args:
+            fetched_subscriptions: Subscriptions whose latest video was fetched
+            latest_videos: Dictionary mapping channel ID to its latest video
+        """
+        for subscription in fetched_subscriptions:
+            channel_id = subscription.channel_id
+            self.state_manager.set_check_pending(
+                channel_id, not self._is_channel_settled(channel_id, latest_videos)
+            )
+    
+    def _is_video_recent_enough(self, video: Video) -> bool:
         """Check if a video is recent enough to notify about.
         
         Args:
-            published_at: Video publish timestamp (ISO format)
+            video: Video with its publish time
             
         Returns:
             True if video is recent enough (within configured days)
         """
-        try:
-            # Parse the published timestamp
-            published_time = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-            
-            # Get current time in UTC
-            current_time = datetime.now(timezone.utc)
-            
-            # Get max age from config (default to 7 days)
-            max_age_days = self.config.get("youtube", {}).get("max_video_age_days", 7)
-            max_age = timedelta(days=max_age_days)
-            
-            # Check if video is within the time window
-            age = current_time - published_time
-            is_recent = age <= max_age
-            
-            logger.debug(f"Video age: {age.days} days, max allowed: {max_age_days} days, recent: {is_recent}")
-            return is_recent
-            
-        except Exception as e:
-            logger.error(f"Error checking video age: {e}")
+        if video.published_epoch is None:
+            logger.error(f"Error checking video age: invalid timestamp {video.published_at!r}")
             # If we can't parse the date, assume it's recent to be safe
             return True
+        
+        is_recent = video.published_epoch >= self._cutoff_epoch
+        logger.debug("Video published at %s, max age: %s days, recent: %s",
+                     video.published_at, self._max_age.days, is_recent)
+        return is_recent
     
-    def _test_connections(self) -> Dict[str, Any]:
+    async def _test_connections(self) -> Dict[str, Any]:
         """Test connections to YouTube and Telegram APIs.
         
         Returns:
@@ -271,18 +647,24 @@ class YouTubeMonitor:
         
         # Test Telegram connection
         logger.info("Testing Telegram bot connection...")
-        tg_success = self.telegram_client.test_connection_sync()
+        tg_success = await self.telegram_client.test_connection()
         results['telegram']['connected'] = tg_success
         
         return results
 
 
-def main():
-    """Main entry point."""
+async def main() -> int:
+    """Main entry point.
+    
+    Returns:
+        Process exit code
+    """
     parser = argparse.ArgumentParser(description='YouTube Subscription Monitor')
     parser.add_argument('--test', action='store_true', help='Test connections only')
     parser.add_argument('--config', default='config.json', help='Path to config file')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    parser.add_argument('--refresh-subs', action='store_true',
+                        help='Fetch subscriptions even if the cached list is fresh')
     
     args = parser.parse_args()
     
@@ -293,19 +675,20 @@ def main():
     try:
         # Create and run monitor
         monitor = YouTubeMonitor(args.config)
-        results = monitor.run(test_mode=args.test)
+        results = await monitor.run(test_mode=args.test, refresh_subscriptions=args.refresh_subs)
         
         # Exit with appropriate code
         if args.test:
             all_connected = all(results[service]['connected'] for service in results)
-            sys.exit(0 if all_connected else 1)
+            return 0 if all_connected else 1
         else:
-            sys.exit(0 if results.get('errors', 0) == 0 else 1)
+            return 0 if results.get('errors', 0) == 0 else 1
             
     except Exception as e:
         logger.error(f"Fatal error: {e}")
-        sys.exit(1)
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    # Everything runs on one event loop so HTTP clients are shared end to end
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,22 @@
+"""Shared fixtures for the monitor tests."""
+
+import os
+import sys
+
+import pytest
+
+# The modules in src/ import each other by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from youtube_monitor import SECRET_ENV_VARS, YouTubeMonitor  # noqa: E402
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "config.json")
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    """A monitor with dummy credentials and its state file in a temporary directory."""
+    for var in SECRET_ENV_VARS.values():
+        monkeypatch.setenv(var, "test")
+    monkeypatch.chdir(tmp_path)
+    return YouTubeMonitor(os.path.abspath(CONFIG_PATH))
@@ -0,0 +1,74 @@
+"""Tests for the state file handling."""
+
+import os
+
+from state_manager import StateManager
+
+
+def make_state_manager(tmp_path):
+    return StateManager(str(tmp_path / "state.json"))
+
+
+def test_save_state_skips_write_when_unchanged(tmp_path):
+    manager = make_state_manager(tmp_path)
+    manager.update_channel_state("UC1", "Channel", "video1", "2024-01-31T12:00:00Z")
+    manager.save_state()
+    state_path = tmp_path / "state.json"
+    saved = state_path.read_bytes()
+    os.utime(state_path, (0, 0))
+    
+    StateManager(str(state_path)).save_state()
+    
+    assert state_path.read_bytes() == saved
+    assert os.stat(state_path).st_mtime == 0
+    assert (tmp_path / "last_run.txt").exists()
+
+
+def test_save_state_writes_changes(tmp_path):
+    manager = make_state_manager(tmp_path)
+    manager.save_state(force=True)
+    
+    manager.update_channel_state("UC1", "Channel", "video1", "2024-01-31T12:00:00Z")
+    manager.save_state()
+    
+    reloaded = make_state_manager(tmp_path)
+    assert not reloaded.is_new_video("UC1", "video1")
+    assert reloaded.is_new_video("UC1", "video2")
+
+
+def test_repeated_values_do_not_mark_state_dirty(tmp_path):
+    manager = make_state_manager(tmp_path)
+    manager.set_etag("UC1", "feed", "etag1")
+    manager.set_video_count("UC1", 10)
+    manager.set_check_pending("UC1", True)
+    manager.save_state()
+    
+    manager.set_etag("UC1", "feed", "etag1")
+    manager.set_video_count("UC1", 10)
+    manager.set_check_pending("UC1", True)
+    
+    assert not manager._dirty
+
+
+def test_check_pending_is_cleared(tmp_path):
+    manager = make_state_manager(tmp_path)
+    manager.set_check_pending("UC1", True)
+    assert manager.is_check_pending("UC1")
+    
+    manager.set_check_pending("UC1", False)
+    
+    assert not manager.is_check_pending("UC1")
+    assert "check_pending" not in manager.get_channel_state("UC1")
+
+
+def test_cached_subscriptions_round_trip(tmp_path):
+    manager = make_state_manager(tmp_path)
+    assert manager.get_cached_subscriptions() == (None, None)
+    
+    items = [{"channel_id": "UC1", "channel_title": "日本 🎬", "thumbnail_url": None}]
+    manager.set_cached_subscriptions(items)
+    manager.save_state()
+    
+    cached, fetched_at = make_state_manager(tmp_path).get_cached_subscriptions()
+    assert cached == items
+    assert fetched_at is not None
@@ -0,0 +1,147 @@
+"""Tests for how the monitor records fetch results between runs."""
+
+import asyncio
+import time
+
+import pytest
+
+from telegram_client import TelegramClient
+from youtube_client import ChannelFetchError, NOT_MODIFIED, Subscription, Video
+
+
+def make_video(video_id, published_epoch=None):
+    published_epoch = published_epoch or int(time.time())
+    return Video(
+        video_id=video_id,
+        title=f"Video {video_id}",
+        published_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(published_epoch)),
+        published_epoch=published_epoch,
+        thumbnail_url=None,
+        video_url=f"https://www.youtube.com/watch?v={video_id}"
+    )
+
+
+def make_subscription(channel_id):
+    return Subscription(channel_id=channel_id, channel_title=channel_id, thumbnail_url=None)
+
+
+def fetch_with_failure(monitor, monkeypatch, results):
+    """Run _fetch_latest_videos with canned per-channel results; exceptions are raised."""
+    async def fake_get_latest_video_async(channel_id, uploads_playlist_id=None):
+        result = results[channel_id]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    monkeypatch.setattr(monitor.youtube_client, "get_latest_video_async", fake_get_latest_video_async)
+    subscriptions = [make_subscription(channel_id) for channel_id in results]
+    return subscriptions, asyncio.run(monitor._fetch_latest_videos(subscriptions, {}))
+
+
+def test_failed_fetch_is_not_settled(monitor, monkeypatch):
+    _, latest_videos = fetch_with_failure(monitor, monkeypatch, {
+        "UCfailed": ChannelFetchError("HTTP 500"),
+        "UCempty": None,
+        "UCunchanged": NOT_MODIFIED
+    })
+    
+    assert "UCfailed" not in latest_videos
+    assert not monitor._is_channel_settled("UCfailed", latest_videos)
+    assert monitor._is_channel_settled("UCempty", latest_videos)
+    assert monitor._is_channel_settled("UCunchanged", latest_videos)
+    assert monitor.stats['errors'] == 1
+
+
+def test_unnotified_video_is_not_settled(monitor):
+    latest_videos = {"UC1": make_video("new")}
+    
+    assert not monitor._is_channel_settled("UC1", latest_videos)
+
+
+def test_video_count_is_not_stored_for_failed_fetch(monitor, monkeypatch):
+    _, latest_videos = fetch_with_failure(monitor, monkeypatch, {
+        "UCfailed": ChannelFetchError("timeout"),
+        "UCempty": None
+    })
+    monitor._video_counts = {"UCfailed": 11, "UCempty": 0}
+    
+    monitor._store_video_counts(latest_videos)
+    
+    assert monitor.state_manager.get_last_video_counts() == {"UCempty": 0}
+
+
+def test_failed_fetch_stays_due(monitor, monkeypatch):
+    # Both channels are long quiet, so only a pending retry makes them due
+    quiet_epoch = int(time.time()) - 30 * 86400
+    for channel_id in ("UCfailed", "UCok"):
+        monitor.state_manager.update_channel_state(
+            channel_id, channel_id, "old", make_video("old", quiet_epoch).published_at
+        )
+    subscriptions, latest_videos = fetch_with_failure(monitor, monkeypatch, {
+        "UCfailed": ChannelFetchError("HTTP 503"),
+        "UCok": NOT_MODIFIED
+    })
+    
+    monitor._store_check_pending(subscriptions, latest_videos)
+    
+    assert monitor.state_manager.is_check_pending("UCfailed")
+    assert not monitor.state_manager.is_check_pending("UCok")
+    due = monitor._filter_due_channels(subscriptions)
+    assert make_subscription("UCfailed") in due
+
+
+def test_new_channel_is_due(monitor):
+    subscriptions = [make_subscription("UCnew")]
+    
+    assert monitor._filter_due_channels(subscriptions) == subscriptions
+
+
+@pytest.mark.parametrize("quiet_seconds, expected", [
+    (0, 1800),
+    (3599, 1800),
+    (3600, 3600),
+    (7199, 3600),
+    (14400, 14400),
+    (30 * 86400, 21600)
+])
+def test_poll_interval_doubles_up_to_max(monitor, quiet_seconds, expected):
+    assert monitor._poll_interval(quiet_seconds, 1800, 21600) == expected
+
+
+def test_stale_subscription_cache_is_used_when_fetch_fails(monitor, monkeypatch):
+    subscription = make_subscription("UC1")
+    monitor.state_manager.set_cached_subscriptions([
+        {"channel_id": "UC1", "channel_title": "UC1", "thumbnail_url": None}
+    ])
+    monitor.state_manager.state["subscriptions"]["fetched_at"] = "2000-01-01T00:00:00"
+    monkeypatch.setattr(monitor.youtube_client, "get_subscriptions", lambda: [])
+    
+    assert monitor._get_subscriptions() == [subscription]
+
+
+def test_get_latest_video_async_raises_when_api_fallback_fails(monitor, monkeypatch):
+    client = monitor.youtube_client
+    
+    async def empty_feed(channel_id):
+        return []
+    
+    async def failing_api(channel_id, max_results=5, uploads_playlist_id=None):
+        raise ChannelFetchError("HTTP 500")
+    
+    monkeypatch.setattr(client, "get_latest_videos_rss", empty_feed)
+    monkeypatch.setattr(client, "get_channel_videos_async", failing_api)
+    
+    with pytest.raises(ChannelFetchError):
+        asyncio.run(client.get_latest_video_async("UC1"))
+
+
+def test_secrets_repr_hides_values(monitor):
+    from youtube_monitor import Secrets
+    
+    assert "test" not in repr(Secrets.from_env())
+
+
+@pytest.mark.parametrize("template", ["{channel}", "{video_title", "{}"])
+def test_invalid_template_is_rejected(template):
+    with pytest.raises(ValueError):
+        TelegramClient._validate_template(template)